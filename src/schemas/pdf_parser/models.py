@@ -8,6 +8,7 @@ class ParserType(str, Enum):
     """PDF parser types."""
 
     DOCLING = "docling"
+    DEEPSEEK = "deepseek"
 
 
 class PaperSection(BaseModel):
@@ -43,6 +44,11 @@ class PdfContent(BaseModel):
     parser_used: ParserType = Field(..., description="Parser used for extraction")
     metadata: Dict[str, Any] = Field(default_factory=dict, description="Parser metadata")
 
+    @property
+    def char_count(self) -> int:
+        """Number of characters of extracted text."""
+        return len(self.raw_text)
+
 
 class ArxivMetadata(BaseModel):
     """Paper metadata from arXiv API."""
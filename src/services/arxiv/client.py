@@ -21,6 +21,28 @@ class ArxivClient:
     def __init__(self, settings: ArxivSettings):
         self._settings = settings
         self._last_request_time: Optional[float] = None
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Shared HTTP client reused across requests.
+
+        Reusing one pooled client keeps TCP+TLS connections alive between
+        API calls and PDF downloads instead of paying a fresh handshake per
+        request.
+
+        :returns: Pooled httpx.AsyncClient instance
+        """
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=float(self.timeout_seconds),
+                limits=httpx.Limits(max_connections=10, max_keepalive_connections=10),
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        """Close the pooled HTTP client and its connections."""
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
 
     @cached_property
     def pdf_cache_dir(self) -> Path:
@@ -113,10 +135,9 @@ class ArxivClient:
 
             self._last_request_time = time.time()
 
-            async with httpx.AsyncClient(timeout=self.timeout_seconds) as client:
-                response = await client.get(url)
-                response.raise_for_status()
-                xml_data = response.text
+            response = await self._get_client().get(url)
+            response.raise_for_status()
+            xml_data = response.text
 
             papers = self._parse_response(xml_data)
             logger.info(f"Fetched {len(papers)} papers")
@@ -188,10 +209,9 @@ class ArxivClient:
 
             self._last_request_time = time.time()
 
-            async with httpx.AsyncClient(timeout=self.timeout_seconds) as client:
-                response = await client.get(url)
-                response.raise_for_status()
-                xml_data = response.text
+            response = await self._get_client().get(url)
+            response.raise_for_status()
+            xml_data = response.text
 
             papers = self._parse_response(xml_data)
             logger.info(f"Query returned {len(papers)} papers")
@@ -226,10 +246,9 @@ class ArxivClient:
         url = f"{self.base_url}?{urlencode(params, quote_via=quote, safe=safe)}"
 
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(url)
-                response.raise_for_status()
-                xml_data = response.text
+            response = await self._get_client().get(url)
+            response.raise_for_status()
+            xml_data = response.text
 
             papers = self._parse_response(xml_data)
 
@@ -455,12 +474,11 @@ class ArxivClient:
 
         for attempt in range(max_retries):
             try:
-                async with httpx.AsyncClient(timeout=float(self.timeout_seconds)) as client:
-                    async with client.stream("GET", url) as response:
-                        response.raise_for_status()
-                        with open(path, "wb") as f:
-                            async for chunk in response.aiter_bytes():
-                                f.write(chunk)
+                async with self._get_client().stream("GET", url) as response:
+                    response.raise_for_status()
+                    with open(path, "wb") as f:
+                        async for chunk in response.aiter_bytes():
+                            f.write(chunk)
                 logger.info(f"Successfully downloaded to {path.name}")
                 return True
 
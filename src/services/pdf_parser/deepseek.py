@@ -0,0 +1,711 @@
+import asyncio
+import io
+import logging
+import os
+import re
+import threading
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+import pypdfium2 as pdfium
+import torch
+from PIL import Image
+from src.exceptions import PDFParsingException, PDFValidationError
+from src.schemas.pdf_parser.models import PaperSection, ParserType, PdfContent
+from transformers import AutoModel, AutoTokenizer
+
+logger = logging.getLogger(__name__)
+
+# PDFium keeps global state and is not thread-safe, and pypdfium2 adds no
+# locking of its own, so every pdfium call in this process is serialized
+# behind this lock — concurrent calls (even on separate documents) can
+# corrupt renders or segfault the interpreter
+_PDFIUM_LOCK = threading.Lock()
+
+# Resolution presets supported by DeepSeek-OCR: (base_size, image_size, crop_mode)
+RESOLUTION_CONFIG = {
+    "tiny": {"base_size": 512, "image_size": 512, "crop_mode": False},
+    "small": {"base_size": 640, "image_size": 640, "crop_mode": False},
+    "base": {"base_size": 1024, "image_size": 640, "crop_mode": True},
+    "large": {"base_size": 1280, "image_size": 1280, "crop_mode": False},
+}
+
+# Normalization constants used by the DeepSeek-OCR vision encoder
+IMAGE_MEAN = (0.5, 0.5, 0.5)
+IMAGE_STD = (0.5, 0.5, 0.5)
+
+# Per-channel normalization folded into a single affine transform:
+# (x / 255 - mean) / std  ==  x * _NORM_SCALE + _NORM_SHIFT
+_NORM_SCALE = (1.0 / (255.0 * np.asarray(IMAGE_STD, dtype=np.float32))).reshape(1, 1, 3)
+_NORM_SHIFT = (-np.asarray(IMAGE_MEAN, dtype=np.float32) / np.asarray(IMAGE_STD, dtype=np.float32)).reshape(1, 1, 3)
+
+OCR_PROMPT = "<image>\n<|grounding|>Convert the document to markdown."
+
+# Decoding guardrails: a small share of pages sends the decoder into a
+# repetition loop, and without caps each such page burns thousands of
+# tokens of GPU time emitting the same phrase
+DEFAULT_GENERATION_KWARGS = {
+    "no_repeat_ngram_size": 6,
+    "repetition_penalty": 1.2,
+    "max_new_tokens": 3072,
+    "early_stopping": True,
+}
+
+# ATX markdown header, precompiled once instead of per line
+_HEADER_RE = re.compile(r"^(#{1,6})\s+(.+)$")
+
+# Seven or more consecutive occurrences of the same word — the signature
+# of a decode loop that slipped past the n-gram guard
+_REPETITION_RE = re.compile(r"(\b\w+\b)(?:\s+\1){6,}")
+
+# Pages wider than this aspect ratio are the primary trigger of decode
+# repetition loops, so they get split into overlapping halves before OCR
+WIDE_ASPECT_RATIO = 1.7
+
+
+def split_wide(image: Image.Image) -> List[Image.Image]:
+    """Split a very wide page into two overlapping column crops.
+
+    The overlap (5% of the width) keeps text straddling the midline legible
+    in both halves; the microseconds of PIL cropping avoid thousands of
+    wasted generate tokens when a wide page sends the decoder into a loop.
+
+    :param image: Rendered page image
+    :returns: The original image, or two overlapping halves if it is wide
+    """
+    width, height = image.size
+    if width / height < WIDE_ASPECT_RATIO:
+        return [image]
+    mid = width // 2
+    overlap = width // 20
+    return [image.crop((0, 0, mid + overlap, height)), image.crop((mid - overlap, 0, width, height))]
+
+# Loaded (model, tokenizer) pairs shared across parser instances in this
+# process, keyed by (model_name, int8, compile_mode). Re-running trust_remote_code module
+# import and the multi-GB weight load per instance dominates short-lived
+# invocations, so pay it once per process instead.
+_MODEL_CACHE: dict = {}
+
+
+class DeepSeekParser:
+    """DeepSeek-OCR PDF parser for scanned or image-heavy documents.
+
+    Renders PDF pages with pypdfium2 and runs them through the DeepSeek-OCR
+    vision-language model in batches, so the GPU processes several pages per
+    forward pass instead of paying per-page kernel-launch and Python overhead.
+    """
+
+    def __init__(
+        self,
+        max_pages: int,
+        max_file_size_mb: int,
+        model_name: str = "deepseek-ai/DeepSeek-OCR",
+        resolution: str = "base",
+        batch_size: int = 10,
+        int8: bool = False,
+        compile_mode: str = "reduce-overhead",
+        backend: str = "hf",
+        generation_kwargs: Optional[dict] = None,
+        debug_image_dir: Optional[Path] = None,
+    ):
+        """Initialize DeepSeek-OCR parser with configurable limits.
+
+        :param max_pages: Maximum number of pages to process
+        :param max_file_size_mb: Maximum file size in MB
+        :param model_name: HuggingFace model identifier
+        :param resolution: One of "tiny", "small", "base", "large" (see RESOLUTION_CONFIG)
+        :param batch_size: Number of page images per GPU forward pass (HF backend)
+        :param int8: Quantize model weights to INT8 via torchao (requires torchao)
+        :param compile_mode: torch.compile mode; "max-autotune" spends longer at
+            warmup autotuning kernels for the fixed input shapes
+        :param backend: "hf" for transformers generate, "vllm" for a vLLM engine
+            with continuous batching (requires vllm)
+        :param generation_kwargs: Decoding options forwarded to model.generate
+            (defaults to DEFAULT_GENERATION_KWARGS)
+        :param debug_image_dir: Directory to dump rendered pages into for debugging
+        """
+        if resolution not in RESOLUTION_CONFIG:
+            raise ValueError(f"Unknown resolution '{resolution}', expected one of {list(RESOLUTION_CONFIG)}")
+        if backend not in ("hf", "vllm"):
+            raise ValueError(f"Unknown backend '{backend}', expected 'hf' or 'vllm'")
+
+        self.max_pages = max_pages
+        self.max_file_size_bytes = max_file_size_mb * 1024 * 1024
+        self.model_name = model_name
+        self.resolution = resolution
+        self.batch_size = batch_size
+        self.int8 = int8
+        self.compile_mode = compile_mode
+        self.backend = backend
+        self.generation_kwargs = dict(DEFAULT_GENERATION_KWARGS if generation_kwargs is None else generation_kwargs)
+        self.debug_image_dir = debug_image_dir
+        self._model = None
+        self._tokenizer = None
+        self._llm = None
+        self._dtype: Optional[torch.dtype] = None
+        self._prompt_ids: Optional[torch.Tensor] = None
+
+    def _lazy_load_model(self) -> None:
+        """Load the DeepSeek-OCR model and tokenizer on first use."""
+        if self._model is not None:
+            return
+
+        cache_key = (self.model_name, self.int8, self.compile_mode)
+        cached = _MODEL_CACHE.get(cache_key)
+        if cached is not None:
+            self._model, self._tokenizer, self._dtype = cached
+            return
+
+        logger.info(f"Loading DeepSeek-OCR model: {self.model_name}")
+
+        # Page inputs have a fixed shape, so cuDNN autotuning converges on the
+        # fastest conv algorithm after the first batch; TF32 speeds up any
+        # fp32 matmuls left outside the bf16 path
+        torch.backends.cuda.matmul.allow_tf32 = True
+        torch.backends.cudnn.allow_tf32 = True
+        torch.backends.cudnn.benchmark = True
+
+        self._tokenizer = AutoTokenizer.from_pretrained(self.model_name, trust_remote_code=True)
+
+        # bf16 needs Ampere (compute capability >= 8); fall back to fp16 on
+        # older GPUs rather than silently running an emulated dtype
+        self._dtype = torch.bfloat16 if torch.cuda.get_device_capability()[0] >= 8 else torch.float16
+
+        # low_cpu_mem_usage + device_map loads mmap'd safetensors shards
+        # directly onto the GPU in the target dtype, skipping the FP32 CPU
+        # staging copy
+        self._model = AutoModel.from_pretrained(
+            self.model_name,
+            trust_remote_code=True,
+            use_safetensors=True,
+            low_cpu_mem_usage=True,
+            torch_dtype=self._dtype,
+            device_map="cuda",
+        )
+        self._model = self._model.eval()
+
+        if self.int8:
+            self._quantize_int8()
+
+        # Fuse kernels and capture CUDA graphs; per-page inputs have a fixed
+        # shape, so static compilation pays off after the first batch.
+        # Compiled in place rather than wrapped: generate() lives on the
+        # original module, and a torch.compile wrapper delegates it via
+        # __getattr__ so its internal forward calls would stay eager.
+        self._model.compile(mode=self.compile_mode, dynamic=False)
+        self._warm_up_model()
+        _MODEL_CACHE[cache_key] = (self._model, self._tokenizer, self._dtype)
+        logger.info("DeepSeek-OCR model loaded")
+
+    def warm_up(self) -> None:
+        """Load, compile and warm the model ahead of the first parse."""
+        if self.backend == "vllm":
+            self._lazy_load_vllm()
+        else:
+            self._lazy_load_model()
+
+    def _lazy_load_vllm(self) -> None:
+        """Load the DeepSeek-OCR model into a vLLM engine on first use."""
+        if self._llm is not None:
+            return
+
+        cache_key = (self.model_name, "vllm")
+        cached = _MODEL_CACHE.get(cache_key)
+        if cached is not None:
+            self._llm = cached
+            return
+
+        from vllm import LLM
+
+        logger.info(f"Loading DeepSeek-OCR model with vLLM: {self.model_name}")
+        self._llm = LLM(
+            model=self.model_name,
+            dtype="bfloat16",
+            gpu_memory_utilization=0.85,
+            max_num_batched_tokens=8192,
+            trust_remote_code=True,
+        )
+        _MODEL_CACHE[cache_key] = self._llm
+        logger.info("DeepSeek-OCR vLLM engine loaded")
+
+    def _quantize_int8(self) -> None:
+        """Quantize model weights to INT8 with torchao, if available.
+
+        Document OCR tolerates mild quantization noise, and INT8 Tensor Core
+        throughput is roughly 2x BF16 on Ampere+ GPUs while halving weight
+        memory. Applied before torch.compile so the quantized graph is what
+        gets compiled.
+        """
+        try:
+            from torchao.quantization import int8_weight_only, quantize_
+        except ImportError:
+            logger.warning("torchao is not installed; skipping INT8 quantization of DeepSeek-OCR model")
+            return
+
+        quantize_(self._model, int8_weight_only())
+        logger.info("Applied INT8 weight-only quantization to DeepSeek-OCR model")
+
+    def _prompt_input_ids(self) -> torch.Tensor:
+        """Tokenize the OCR prompt once and reuse the ids on every batch.
+
+        Goes through the tokenizer's chat template when the checkpoint ships
+        one, so the prompt carries the role markers the model was trained
+        with; checkpoints without a template fall back to the raw prompt.
+
+        :returns: Prompt token ids of shape (1, prompt_len), on the GPU
+        """
+        if self._prompt_ids is None:
+            if getattr(self._tokenizer, "chat_template", None):
+                self._prompt_ids = self._tokenizer.apply_chat_template(
+                    [{"role": "user", "content": OCR_PROMPT}], add_generation_prompt=True, return_tensors="pt"
+                ).to("cuda")
+            else:
+                self._prompt_ids = self._tokenizer(OCR_PROMPT, return_tensors="pt").input_ids.to("cuda")
+        return self._prompt_ids
+
+    def _warm_up_model(self) -> None:
+        """Run one dummy forward so torch.compile traces and builds its CUDA
+        graphs before the first real page hits the model.
+
+        Logs the dynamo graph count afterwards: if the warmup captured no
+        graphs, the compile path is dead and compile_mode is a no-op, which
+        should be loudly visible rather than silently eager."""
+        image_size = RESOLUTION_CONFIG[self.resolution]["image_size"]
+        dummy = Image.new("RGB", (image_size, image_size), color="white")
+        pixel_values = self._preprocess(dummy).unsqueeze(0).to("cuda", dtype=self._dtype)
+        input_ids = self._prompt_input_ids()
+        with torch.inference_mode():
+            self._model.generate(input_ids=input_ids, pixel_values=pixel_values, max_new_tokens=1, do_sample=False)
+
+        graphs = torch._dynamo.utils.counters["stats"]["unique_graphs"]
+        if graphs:
+            logger.info(f"torch.compile warmup captured {graphs} graphs (mode={self.compile_mode})")
+        else:
+            logger.warning("torch.compile captured no graphs during warmup; model is running eager and compile_mode has no effect")
+
+    def _validate_pdf(
+        self, pdf_path: Path, stat_result: Optional[os.stat_result] = None, pdf_bytes: Optional[bytes] = None
+    ) -> tuple[pdfium.PdfDocument, int]:
+        """Comprehensive PDF validation including size and page limits.
+
+        Returns the opened pdfium document and its page count so rendering
+        can reuse both instead of paying a second xref parse and page-count
+        call; the caller owns closing the document.
+
+        :param pdf_path: Path to PDF file
+        :param stat_result: Pre-computed os.stat result to avoid redundant syscalls
+        :param pdf_bytes: Pre-read file contents; skips all filesystem access
+        :returns: Tuple of (open pdfium.PdfDocument, page count)
+        """
+        pdf_doc: Optional[pdfium.PdfDocument] = None
+        try:
+            if pdf_bytes is not None:
+                file_size = len(pdf_bytes)
+            else:
+                if stat_result is None:
+                    stat_result = pdf_path.stat()
+                file_size = stat_result.st_size
+
+            # Check file exists and is not empty
+            if file_size == 0:
+                logger.error(f"PDF file is empty: {pdf_path}")
+                raise PDFValidationError(f"PDF file is empty: {pdf_path}")
+
+            # Check file size limit
+            if file_size > self.max_file_size_bytes:
+                logger.warning(
+                    f"PDF file size ({file_size / 1024 / 1024:.1f}MB) exceeds limit ({self.max_file_size_bytes / 1024 / 1024:.1f}MB), skipping processing"
+                )
+                raise PDFValidationError(
+                    f"PDF file too large: {file_size / 1024 / 1024:.1f}MB > {self.max_file_size_bytes / 1024 / 1024:.1f}MB"
+                )
+
+            if pdf_bytes is not None:
+                if not pdf_bytes.startswith(b"%PDF-"):
+                    logger.error(f"File does not have PDF header: {pdf_path}")
+                    raise PDFValidationError(f"File does not have PDF header: {pdf_path}")
+                with _PDFIUM_LOCK:
+                    pdf_doc = pdfium.PdfDocument(pdf_bytes)
+            else:
+                # Check the PDF header and hand the same file object to pdfium, so
+                # validation and document open share one open() and a warm page cache
+                pdf_file = open(pdf_path, "rb")
+                try:
+                    header = pdf_file.read(8)
+                    if not header.startswith(b"%PDF-"):
+                        logger.error(f"File does not have PDF header: {pdf_path}")
+                        raise PDFValidationError(f"File does not have PDF header: {pdf_path}")
+
+                    pdf_file.seek(0)
+                    # autoclose ties the file's lifetime to the document's
+                    with _PDFIUM_LOCK:
+                        pdf_doc = pdfium.PdfDocument(pdf_file, autoclose=True)
+                except Exception:
+                    if pdf_doc is None:
+                        pdf_file.close()
+                    raise
+
+            # Check page count limit
+            with _PDFIUM_LOCK:
+                actual_pages = len(pdf_doc)
+
+            if actual_pages > self.max_pages:
+                logger.warning(
+                    f"PDF has {actual_pages} pages, exceeding limit of {self.max_pages} pages. Skipping processing to avoid performance issues."
+                )
+                raise PDFValidationError(f"PDF has too many pages: {actual_pages} > {self.max_pages}")
+
+            return pdf_doc, actual_pages
+
+        except PDFValidationError:
+            if pdf_doc is not None:
+                with _PDFIUM_LOCK:
+                    pdf_doc.close()
+            raise
+        except Exception as e:
+            if pdf_doc is not None:
+                with _PDFIUM_LOCK:
+                    pdf_doc.close()
+            logger.error(f"Error validating PDF {pdf_path}: {e}")
+            raise PDFValidationError(f"Error validating PDF {pdf_path}: {e}")
+
+    def _render_pages(self, pdf_doc: pdfium.PdfDocument, page_indices: range) -> List[Image.Image]:
+        """Render a range of PDF pages to in-memory PIL images for OCR.
+
+        Keeping the bitmaps in memory avoids a PNG encode/decode round-trip
+        per page (and the temp-dir I/O that went with it). Pages are rendered
+        sequentially under _PDFIUM_LOCK — PDFium is not thread-safe, so the
+        lock is what makes it safe to call this from a producer thread while
+        other documents are open; the pipelining in _ocr_pdf_pipelined still
+        overlaps this work with GPU inference.
+
+        :param pdf_doc: Open pdfium document (ownership stays with the caller)
+        :param page_indices: Zero-based indices of the pages to render
+        :returns: Rendered page images, in page order
+        """
+        images: List[Image.Image] = []
+        for page_index in page_indices:
+            # Lock per page rather than per batch so other pdfium users
+            # (validation, the harness probe) interleave instead of stalling
+            # for a whole batch render
+            with _PDFIUM_LOCK:
+                page = pdf_doc[page_index]
+                image = page.render(scale=self._render_scale(page), grayscale=True).to_pil()
+            self._maybe_dump_page(image, page_index)
+            images.append(image)
+        return images
+
+    def _render_scale(self, page: pdfium.PdfPage) -> float:
+        """Pick a render scale matched to the OCR input size.
+
+        Rendering at a fixed scale=2.0 rasterizes ~1700x2200 bitmaps that the
+        "tiny"/"small" presets immediately downsample; aiming the long edge at
+        the model's image_size (with 10% headroom for crop-mode tiling) makes
+        pdfium draw only the pixels the encoder will actually see.
+
+        :param page: pdfium page to be rendered
+        :returns: Scale factor for PdfPage.render
+        """
+        image_size = RESOLUTION_CONFIG[self.resolution]["image_size"]
+        width_pt, height_pt = page.get_size()
+        scale = image_size * 1.1 / max(width_pt, height_pt)
+        return min(scale, 2.0)
+
+    def _maybe_dump_page(self, image: Image.Image, page_index: int) -> None:
+        """Save a rendered page for debugging, if a dump directory is set.
+
+        Uses BMP rather than PNG: the dumps are only for inspection, and
+        skipping the deflate encode keeps the save at a few ms per page.
+
+        :param image: Rendered page image
+        :param page_index: Zero-based page index used in the filename
+        """
+        if self.debug_image_dir is None:
+            return
+        self.debug_image_dir.mkdir(parents=True, exist_ok=True)
+        image.save(self.debug_image_dir / f"page_{page_index:04d}.bmp", format="BMP")
+
+    def _preprocess(self, pil_image: Image.Image) -> torch.Tensor:
+        """Convert a rendered page into a normalized CHW float tensor.
+
+        :param pil_image: Rendered page image
+        :returns: Normalized tensor of shape (3, image_size, image_size)
+        """
+        image_size = RESOLUTION_CONFIG[self.resolution]["image_size"]
+        resized = pil_image.convert("RGB").resize((image_size, image_size), Image.Resampling.LANCZOS)
+        # One SIMD-friendly multiply-add over the whole bitmap instead of
+        # separate divide/subtract/divide passes with temporaries
+        array = np.asarray(resized, dtype=np.float32) * _NORM_SCALE + _NORM_SHIFT
+        return torch.from_numpy(np.ascontiguousarray(array.transpose(2, 0, 1)))
+
+    def _extract_text_from_images_batch(self, images: List[Image.Image], batch_size: Optional[int] = None) -> List[str]:
+        """Run OCR over page images in batches through a single model forward per batch.
+
+        Batching amortizes kernel-launch and HF dispatch overhead across pages
+        instead of re-entering the model once per page. Very wide pages are
+        split into overlapping halves first (see split_wide) and their crop
+        texts rejoined, so each model input keeps a loop-safe aspect ratio.
+
+        :param images: Rendered page images, in page order
+        :param batch_size: Pages per forward pass (defaults to self.batch_size)
+        :returns: Extracted markdown text per page, in page order
+        """
+        if batch_size is None:
+            batch_size = self.batch_size
+
+        crops: List[Image.Image] = []
+        crops_per_page: List[int] = []
+        for image in images:
+            page_crops = split_wide(image)
+            crops_per_page.append(len(page_crops))
+            crops.extend(page_crops)
+
+        crop_texts = self._extract_crop_texts(crops, batch_size)
+
+        page_texts: List[str] = []
+        cursor = 0
+        for span in crops_per_page:
+            page_texts.append("\n".join(crop_texts[cursor : cursor + span]))
+            cursor += span
+        return page_texts
+
+    def _extract_crop_texts(self, images: List[Image.Image], batch_size: int) -> List[str]:
+        """Run OCR over preprocessed page crops in fixed-size batches.
+
+        :param images: Page crops, in page order
+        :param batch_size: Crops per forward pass
+        :returns: Extracted markdown text per crop, in order
+        """
+        if self.backend == "vllm":
+            return self._extract_text_vllm(images)
+
+        self._lazy_load_model()
+
+        prompt_ids = self._prompt_input_ids()
+
+        page_texts: List[str] = []
+        for start in range(0, len(images), batch_size):
+            batch_images = images[start : start + batch_size]
+
+            pixel_values = torch.stack([self._preprocess(image) for image in batch_images])
+            # Pinned host memory lets the copy engine run the H2D transfer
+            # asynchronously, overlapping it with compute on the GPU
+            pixel_values = pixel_values.pin_memory()
+            pixel_values = pixel_values.to("cuda", dtype=self._dtype, non_blocking=True)
+            input_ids = prompt_ids.expand(pixel_values.shape[0], -1)
+
+            with torch.inference_mode():
+                output_ids = self._model.generate(
+                    input_ids=input_ids,
+                    pixel_values=pixel_values,
+                    do_sample=False,
+                    **self.generation_kwargs,
+                )
+
+            decoded = self._tokenizer.batch_decode(output_ids[:, input_ids.shape[1] :], skip_special_tokens=True)
+            for offset, text in enumerate(decoded):
+                text = text.strip()
+                if _REPETITION_RE.search(text):
+                    text = self._retry_repetitive_page(batch_images[offset])
+                page_texts.append(text)
+
+        return page_texts
+
+    def _retry_repetitive_page(self, image: Image.Image) -> str:
+        """Re-run one page with stricter decoding caps after a repetition loop.
+
+        :param image: Rendered page image that produced looping output
+        :returns: Extracted markdown text from the retry
+        """
+        logger.warning("Repetition loop detected in OCR output; retrying page with stricter decoding caps")
+        strict = {**self.generation_kwargs, "max_new_tokens": 1024, "repetition_penalty": 1.5, "no_repeat_ngram_size": 4}
+        pixel_values = self._preprocess(image).unsqueeze(0).to("cuda", dtype=self._dtype)
+        input_ids = self._prompt_input_ids()
+        with torch.inference_mode():
+            output_ids = self._model.generate(input_ids=input_ids, pixel_values=pixel_values, do_sample=False, **strict)
+        return self._tokenizer.batch_decode(output_ids[:, input_ids.shape[1] :], skip_special_tokens=True)[0].strip()
+
+    def _extract_text_vllm(self, images: List[Image.Image]) -> List[str]:
+        """Run OCR through the vLLM engine in a single dynamically batched call.
+
+        vLLM's continuous batching packs all submitted pages into shared
+        forward passes (up to max_num_batched_tokens), so the whole document
+        is handed over at once instead of looping in fixed-size chunks.
+
+        :param images: Rendered page images, in page order
+        :returns: Extracted markdown text per page, in page order
+        """
+        from vllm import SamplingParams
+
+        self._lazy_load_vllm()
+
+        sampling_params = SamplingParams(
+            temperature=0.0,
+            max_tokens=self.generation_kwargs.get("max_new_tokens", DEFAULT_GENERATION_KWARGS["max_new_tokens"]),
+            repetition_penalty=self.generation_kwargs.get("repetition_penalty", 1.2),
+        )
+        requests = [{"prompt": OCR_PROMPT, "multi_modal_data": {"image": image.convert("RGB")}} for image in images]
+        outputs = self._llm.generate(requests, sampling_params)
+        return [output.outputs[0].text.strip() for output in outputs]
+
+    async def _ocr_pdf_pipelined(self, pdf_doc: pdfium.PdfDocument, n_pages: int) -> str:
+        """Overlap page rendering with GPU inference via a bounded queue.
+
+        A producer thread renders batches of pages into an asyncio.Queue while
+        the consumer runs OCR on already-rendered batches, so end-to-end time
+        approaches max(render, inference) instead of their sum. The queue is
+        bounded and finished bitmaps are dropped as soon as their text is
+        extracted, keeping peak memory at O(batch_size) pages rather than
+        O(n_pages).
+
+        :param pdf_doc: Open pdfium document (ownership stays with the caller)
+        :param n_pages: Number of pages to process (validated page count)
+        :returns: Extracted markdown text for the whole document
+        """
+        # Load before the producer starts so render work does not sit in the
+        # queue behind a multi-GB weight load
+        self.warm_up()
+
+        loop = asyncio.get_running_loop()
+        queue: "asyncio.Queue[Optional[List[Image.Image]]]" = asyncio.Queue(maxsize=2)
+        # Set when the consumer stops early (OCR failure, cancellation) so
+        # the producer thread exits instead of blocking on the full queue
+        stop = threading.Event()
+
+        def produce() -> None:
+            for start in range(0, n_pages, self.batch_size):
+                if stop.is_set():
+                    return
+                batch = self._render_pages(pdf_doc, range(start, min(start + self.batch_size, n_pages)))
+                if stop.is_set():
+                    return
+                # Blocks when the queue is full, giving natural backpressure
+                asyncio.run_coroutine_threadsafe(queue.put(batch), loop).result()
+            asyncio.run_coroutine_threadsafe(queue.put(None), loop).result()
+
+        producer = asyncio.create_task(asyncio.to_thread(produce))
+
+        try:
+            buffer = io.StringIO()
+            pages_done = 0
+            while True:
+                batch = await queue.get()
+                if batch is None:
+                    break
+                for text in await loop.run_in_executor(None, self._extract_text_from_images_batch, batch):
+                    if pages_done:
+                        buffer.write("\n\n")
+                    buffer.write(text)
+                    pages_done += 1
+                # Drop the rendered bitmaps as soon as their text is extracted
+                batch.clear()
+            return buffer.getvalue()
+        finally:
+            # Always wind the producer down before returning: drain the queue
+            # so a put blocked on the bounded queue can complete and the
+            # thread can observe the stop flag. Only after the thread has
+            # exited is it safe for the caller to close pdf_doc, which the
+            # producer renders from.
+            stop.set()
+            while not producer.done():
+                while not queue.empty():
+                    queue.get_nowait()
+                await asyncio.sleep(0.01)
+            await producer
+
+    def _parse_markdown_to_sections(self, markdown_text: str) -> List[PaperSection]:
+        """Split OCR markdown output into sections on ATX headers.
+
+        :param markdown_text: Markdown text produced by the OCR model
+        :returns: List of PaperSection objects
+        """
+        sections: List[PaperSection] = []
+        title = "Content"
+        level = 1
+        content_lines: List[str] = []
+
+        def flush() -> None:
+            content = "\n".join(content_lines).strip()
+            if content:
+                sections.append(PaperSection(title=title, content=content, level=level))
+
+        for line in markdown_text.splitlines():
+            match = _HEADER_RE.match(line)
+            if match:
+                flush()
+                title = match.group(2).strip()
+                level = len(match.group(1))
+                content_lines = []
+            else:
+                content_lines.append(line)
+
+        flush()
+        return sections
+
+    async def parse_pdf(
+        self,
+        pdf_path: Path,
+        stat_result: Optional[os.stat_result] = None,
+        images: Optional[List[Image.Image]] = None,
+        pdf_bytes: Optional[bytes] = None,
+    ) -> Optional[PdfContent]:
+        """Parse PDF by rendering pages and running batched DeepSeek-OCR inference.
+
+        :param pdf_path: Path to PDF file
+        :param stat_result: Pre-computed os.stat result to avoid redundant syscalls
+        :param images: Pre-rendered page images; skips opening and rasterizing
+            the PDF so one decode can be shared across consumers
+        :param pdf_bytes: Pre-read file contents; parsing works from memory so a
+            caller can do the blocking read off the event loop
+        :returns: PdfContent object or None if parsing failed
+        """
+        try:
+            if images is not None:
+                n_pages = len(images)
+                loop = asyncio.get_running_loop()
+                page_texts = await loop.run_in_executor(None, self._extract_text_from_images_batch, images)
+                full_text = "\n\n".join(page_texts)
+            else:
+                # Validate PDF first (includes size and page limits); reuse the
+                # opened document for rendering instead of re-parsing the xref
+                pdf_doc, n_pages = self._validate_pdf(pdf_path, stat_result=stat_result, pdf_bytes=pdf_bytes)
+                try:
+                    full_text = await self._ocr_pdf_pipelined(pdf_doc, n_pages)
+                finally:
+                    with _PDFIUM_LOCK:
+                        pdf_doc.close()
+
+            sections = self._parse_markdown_to_sections(full_text)
+
+            return PdfContent(
+                sections=sections,
+                figures=[],
+                tables=[],
+                raw_text=full_text,
+                references=[],
+                parser_used=ParserType.DEEPSEEK,
+                metadata={
+                    "source": "deepseek-ocr",
+                    "resolution": self.resolution,
+                    "pages_processed": n_pages,
+                },
+            )
+
+        except PDFValidationError as e:
+            # Handle size/page limit validation errors gracefully by returning None
+            error_msg = str(e).lower()
+            if "too large" in error_msg or "too many pages" in error_msg:
+                logger.info(f"Skipping PDF processing due to size/page limits: {e}")
+                return None
+            else:
+                # Re-raise other validation errors (corrupted files, etc.)
+                raise
+        except torch.cuda.OutOfMemoryError:
+            # Surface OOM unwrapped so callers can empty the allocator cache
+            # and retry at a lower resolution
+            raise
+        except Exception as e:
+            logger.error(f"Failed to parse PDF with DeepSeek-OCR: {e}")
+            logger.error(f"PDF path: {pdf_path}")
+            raise PDFParsingException(f"Failed to parse PDF with DeepSeek-OCR: {e}")
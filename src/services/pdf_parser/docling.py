@@ -1,9 +1,12 @@
+import asyncio
 import logging
+import os
+from io import BytesIO
 from pathlib import Path
 from typing import Optional
 
 import pypdfium2 as pdfium
-from docling.datamodel.base_models import InputFormat
+from docling.datamodel.base_models import DocumentStream, InputFormat
 from docling.datamodel.pipeline_options import PdfPipelineOptions
 from docling.document_converter import DocumentConverter, PdfFormatOption
 from src.exceptions import PDFParsingException, PDFValidationError
@@ -40,20 +43,30 @@ class DoclingParser:
             # This happens only once per DoclingParser instance
             self._warmed_up = True
 
-    def _validate_pdf(self, pdf_path: Path) -> bool:
+    def _validate_pdf(
+        self, pdf_path: Path, stat_result: Optional[os.stat_result] = None, pdf_bytes: Optional[bytes] = None
+    ) -> bool:
         """Comprehensive PDF validation including size and page limits.
 
         :param pdf_path: Path to PDF file
+        :param stat_result: Pre-computed os.stat result to avoid redundant syscalls
+        :param pdf_bytes: Pre-read file contents; skips all filesystem access
         :returns: True if PDF appears valid and within limits, False otherwise
         """
         try:
+            if pdf_bytes is not None:
+                file_size = len(pdf_bytes)
+            else:
+                if stat_result is None:
+                    stat_result = pdf_path.stat()
+                file_size = stat_result.st_size
+
             # Check file exists and is not empty
-            if pdf_path.stat().st_size == 0:
+            if file_size == 0:
                 logger.error(f"PDF file is empty: {pdf_path}")
                 raise PDFValidationError(f"PDF file is empty: {pdf_path}")
 
             # Check file size limit
-            file_size = pdf_path.stat().st_size
             if file_size > self.max_file_size_bytes:
                 logger.warning(
                     f"PDF file size ({file_size / 1024 / 1024:.1f}MB) exceeds limit ({self.max_file_size_bytes / 1024 / 1024:.1f}MB), skipping processing"
@@ -63,14 +76,17 @@ class DoclingParser:
                 )
 
             # Check if file starts with PDF header
-            with open(pdf_path, "rb") as f:
-                header = f.read(8)
-                if not header.startswith(b"%PDF-"):
-                    logger.error(f"File does not have PDF header: {pdf_path}")
-                    raise PDFValidationError(f"File does not have PDF header: {pdf_path}")
+            if pdf_bytes is not None:
+                header = pdf_bytes[:8]
+            else:
+                with open(pdf_path, "rb") as f:
+                    header = f.read(8)
+            if not header.startswith(b"%PDF-"):
+                logger.error(f"File does not have PDF header: {pdf_path}")
+                raise PDFValidationError(f"File does not have PDF header: {pdf_path}")
 
             # Check page count limit
-            pdf_doc = pdfium.PdfDocument(str(pdf_path))
+            pdf_doc = pdfium.PdfDocument(pdf_bytes if pdf_bytes is not None else str(pdf_path))
             actual_pages = len(pdf_doc)
             pdf_doc.close()
 
@@ -88,23 +104,37 @@ class DoclingParser:
             logger.error(f"Error validating PDF {pdf_path}: {e}")
             raise PDFValidationError(f"Error validating PDF {pdf_path}: {e}")
 
-    async def parse_pdf(self, pdf_path: Path) -> Optional[PdfContent]:
+    async def parse_pdf(
+        self, pdf_path: Path, stat_result: Optional[os.stat_result] = None, pdf_bytes: Optional[bytes] = None
+    ) -> Optional[PdfContent]:
         """Parse PDF using Docling parser.
         Limited to 20 pages to avoid memory issues with large papers.
 
         :param pdf_path: Path to PDF file
+        :param stat_result: Pre-computed os.stat result to avoid redundant syscalls
+        :param pdf_bytes: Pre-read file contents; parsing works from memory so a
+            caller can do the blocking read off the event loop (or skip it when
+            the bytes are already in hand)
         :returns: PdfContent object or None if parsing failed
         """
         try:
             # Validate PDF first (includes size and page limits)
-            self._validate_pdf(pdf_path)
+            self._validate_pdf(pdf_path, stat_result=stat_result, pdf_bytes=pdf_bytes)
 
             # Warm up models on first use
             self._warm_up_models()
 
             # Convert PDF using the modern API
             # Limit processing to avoid memory issues with large papers
-            result = self._converter.convert(str(pdf_path), max_num_pages=self.max_pages, max_file_size=self.max_file_size_bytes)
+            if pdf_bytes is not None:
+                source = DocumentStream(name=pdf_path.name, stream=BytesIO(pdf_bytes))
+            else:
+                source = str(pdf_path)
+            # convert() is synchronous CPU work; run it in a thread so the
+            # event loop stays free and concurrent tasks actually overlap
+            result = await asyncio.to_thread(
+                self._converter.convert, source, max_num_pages=self.max_pages, max_file_size=self.max_file_size_bytes
+            )
 
             # Extract structured content
             doc = result.document
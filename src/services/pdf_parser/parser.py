@@ -25,12 +25,16 @@ class PDFParserService:
         :param pdf_path: Path to PDF file
         :returns: PdfContent object or None if parsing failed
         """
-        if not pdf_path.exists():
+        # Stat once and thread the result into validation, instead of an
+        # exists() check followed by further stat() calls in the parser
+        try:
+            stat_result = pdf_path.stat()
+        except FileNotFoundError:
             logger.error(f"PDF file not found: {pdf_path}")
             raise PDFValidationError(f"PDF file not found: {pdf_path}")
 
         try:
-            result = await self.docling_parser.parse_pdf(pdf_path)
+            result = await self.docling_parser.parse_pdf(pdf_path, stat_result=stat_result)
             if result:
                 logger.info(f"Parsed {pdf_path.name}")
                 return result
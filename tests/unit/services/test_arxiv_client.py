@@ -60,7 +60,7 @@ class TestArxivClient:
             mock_response.text = mock_arxiv_response
             mock_response.raise_for_status.return_value = None
 
-            mock_client.return_value.__aenter__.return_value.get = AsyncMock(return_value=mock_response)
+            mock_client.return_value.get = AsyncMock(return_value=mock_response)
 
             papers = await arxiv_client.fetch_papers(max_results=1)
 
@@ -79,20 +79,20 @@ class TestArxivClient:
             mock_response.text = mock_arxiv_response
             mock_response.raise_for_status.return_value = None
 
-            mock_client.return_value.__aenter__.return_value.get = AsyncMock(return_value=mock_response)
+            mock_client.return_value.get = AsyncMock(return_value=mock_response)
 
             papers = await arxiv_client.fetch_papers(max_results=1, from_date="20240101", to_date="20240131")
 
             assert len(papers) == 1
             # Verify the URL includes date filters
-            call_args = mock_client.return_value.__aenter__.return_value.get.call_args[0][0]
+            call_args = mock_client.return_value.get.call_args[0][0]
             assert "submittedDate:[202401010000+TO+202401312359]" in call_args
 
     @pytest.mark.asyncio
     async def test_fetch_papers_http_timeout(self, arxiv_client):
         """Test handling of HTTP timeout errors."""
         with patch("httpx.AsyncClient") as mock_client:
-            mock_client.return_value.__aenter__.return_value.get = AsyncMock(
+            mock_client.return_value.get = AsyncMock(
                 side_effect=httpx.TimeoutException("Request timeout")
             )
 
@@ -107,7 +107,7 @@ class TestArxivClient:
         with patch("httpx.AsyncClient") as mock_client:
             mock_response = MagicMock()
             mock_response.status_code = 500
-            mock_client.return_value.__aenter__.return_value.get = AsyncMock(
+            mock_client.return_value.get = AsyncMock(
                 side_effect=httpx.HTTPStatusError("Server error", request=MagicMock(), response=mock_response)
             )
 
@@ -124,7 +124,7 @@ class TestArxivClient:
             mock_response.text = mock_arxiv_response
             mock_response.raise_for_status.return_value = None
 
-            mock_client.return_value.__aenter__.return_value.get = AsyncMock(return_value=mock_response)
+            mock_client.return_value.get = AsyncMock(return_value=mock_response)
 
             paper = await arxiv_client.fetch_paper_by_id("2024.0001v1")
 
@@ -144,7 +144,7 @@ class TestArxivClient:
             mock_response.text = empty_response
             mock_response.raise_for_status.return_value = None
 
-            mock_client.return_value.__aenter__.return_value.get = AsyncMock(return_value=mock_response)
+            mock_client.return_value.get = AsyncMock(return_value=mock_response)
 
             paper = await arxiv_client.fetch_paper_by_id("nonexistent")
 
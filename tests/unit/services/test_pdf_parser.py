@@ -1,9 +1,10 @@
 from pathlib import Path
-from unittest.mock import MagicMock, mock_open, patch
+from unittest.mock import ANY, MagicMock, mock_open, patch
 
 import pytest
 from src.exceptions import PDFParsingException, PDFValidationError
 from src.schemas.pdf_parser.models import PaperSection, ParserType, PdfContent
+from src.services.pdf_parser.deepseek import DeepSeekParser
 from src.services.pdf_parser.docling import DoclingParser
 from src.services.pdf_parser.factory import make_pdf_parser_service
 from src.services.pdf_parser.parser import PDFParserService
@@ -75,6 +76,109 @@ class TestDoclingParser:
     # Complex PDF parsing tests removed - too dependent on external libraries
 
 
+class TestDeepSeekParser:
+    """Test DeepSeekParser functionality (CPU-only paths)."""
+
+    @pytest.fixture
+    def deepseek_parser(self):
+        """Create DeepSeekParser instance for testing."""
+        return DeepSeekParser(max_pages=20, max_file_size_mb=10)
+
+    @pytest.fixture
+    def empty_pdf_path(self, tmp_path):
+        """Create an empty PDF file path."""
+        pdf_file = tmp_path / "empty.pdf"
+        pdf_file.write_bytes(b"")
+        return pdf_file
+
+    @pytest.fixture
+    def invalid_pdf_path(self, tmp_path):
+        """Create an invalid PDF file path."""
+        pdf_file = tmp_path / "invalid.pdf"
+        pdf_file.write_bytes(b"Not a PDF file")
+        return pdf_file
+
+    def test_deepseek_parser_initialization(self, deepseek_parser):
+        """Test DeepSeekParser initialization."""
+        assert deepseek_parser.max_pages == 20
+        assert deepseek_parser.max_file_size_bytes == 10 * 1024 * 1024
+        assert deepseek_parser.resolution == "base"
+        assert deepseek_parser._model is None
+
+    def test_deepseek_parser_invalid_resolution(self):
+        """Test DeepSeekParser rejects unknown resolution presets."""
+        with pytest.raises(ValueError):
+            DeepSeekParser(max_pages=20, max_file_size_mb=10, resolution="huge")
+
+    def test_deepseek_parser_default_generation_kwargs(self, deepseek_parser):
+        """Test that decoding guardrails are applied by default."""
+        assert deepseek_parser.generation_kwargs["no_repeat_ngram_size"] == 6
+        assert deepseek_parser.generation_kwargs["max_new_tokens"] == 3072
+
+    def test_repetition_detector(self):
+        """Test that looping OCR output is flagged by the repetition regex."""
+        from src.services.pdf_parser.deepseek import _REPETITION_RE
+
+        assert _REPETITION_RE.search("the " * 10)
+        assert not _REPETITION_RE.search("normal prose without any decode loops")
+
+    def test_split_wide_pages(self):
+        """Test that wide pages are split into two overlapping halves."""
+        from PIL import Image
+        from src.services.pdf_parser.deepseek import split_wide
+
+        tall = Image.new("RGB", (100, 200))
+        assert split_wide(tall) == [tall]
+
+        wide = Image.new("RGB", (400, 200))
+        halves = split_wide(wide)
+        assert len(halves) == 2
+        assert halves[0].size == (220, 200)
+        assert halves[1].size == (220, 200)
+
+    def test_deepseek_parser_invalid_backend(self):
+        """Test DeepSeekParser rejects unknown inference backends."""
+        with pytest.raises(ValueError):
+            DeepSeekParser(max_pages=20, max_file_size_mb=10, backend="onnx")
+
+    def test_validate_pdf_empty_file(self, deepseek_parser, empty_pdf_path):
+        """Test PDF validation with empty file."""
+        with pytest.raises(PDFValidationError) as exc_info:
+            deepseek_parser._validate_pdf(empty_pdf_path)
+
+        assert "PDF file is empty" in str(exc_info.value)
+
+    def test_validate_pdf_invalid_header(self, deepseek_parser, invalid_pdf_path):
+        """Test PDF validation with invalid header."""
+        with pytest.raises(PDFValidationError) as exc_info:
+            deepseek_parser._validate_pdf(invalid_pdf_path)
+
+        assert "File does not have PDF header" in str(exc_info.value)
+
+    def test_parse_markdown_to_sections(self, deepseek_parser):
+        """Test markdown section parsing from OCR output."""
+        markdown = "# Introduction\nIntro text here.\n## Background\nMore details.\nSecond line.\n"
+        sections = deepseek_parser._parse_markdown_to_sections(markdown)
+
+        assert len(sections) == 2
+        assert sections[0].title == "Introduction"
+        assert sections[0].content == "Intro text here."
+        assert sections[0].level == 1
+        assert sections[1].title == "Background"
+        assert sections[1].content == "More details.\nSecond line."
+        assert sections[1].level == 2
+
+    def test_parse_markdown_preamble_before_first_header(self, deepseek_parser):
+        """Test that text before the first header lands in a default section."""
+        markdown = "Some preamble text.\n# Section One\nBody.\n"
+        sections = deepseek_parser._parse_markdown_to_sections(markdown)
+
+        assert len(sections) == 2
+        assert sections[0].title == "Content"
+        assert sections[0].content == "Some preamble text."
+        assert sections[1].title == "Section One"
+
+
 class TestPDFParserService:
     """Test PDFParserService functionality."""
 
@@ -117,7 +221,7 @@ class TestPDFParserService:
         result = await pdf_parser_service.parse_pdf(valid_pdf_path)
 
         assert result == mock_content
-        mock_parse.assert_called_once_with(valid_pdf_path)
+        mock_parse.assert_called_once_with(valid_pdf_path, stat_result=ANY)
 
     @patch("src.services.pdf_parser.parser.DoclingParser.parse_pdf")
     @pytest.mark.asyncio